@@ -1,10 +1,18 @@
+import atexit as _atexit
 import json as _json
 import fnmatch as _fnmatch
-from logging import root
 import os as _os
-import pathlib as _pathlib
+import queue as _queue
+import re as _re
+import sys as _sys
+import threading as _threading
 import concurrent.futures as _futures
 
+try:
+    import orjson as _orjson
+except ImportError:
+    _orjson = None
+
 from . import _helpers
 
 _MAX_WORKERS = 32
@@ -15,56 +23,26 @@ _SCAN_HIDDEN_FILES = True
 _WILDCARD_CHARS = set("*?[")
 
 _DEEP_SCAN_CACHE: dict = {}
+_DEEP_SCAN_CACHE_MAX = 8
+_DEEP_SCAN_CACHE_LOCK = _threading.Lock()
 
+_EXECUTOR: _futures.ThreadPoolExecutor | None = None
+_EXECUTOR_LOCK = _threading.Lock()
 
-def _normalise(item: str) -> str:
-    return item if any(c in item for c in _WILDCARD_CHARS) else f"*{item}*"
-
-
-def _ignore_dir(path: str, name: str, ignore_dirs: set[str], scan_hidden: bool) -> bool:
-    return (
-        name in ignore_dirs or 
-        path in ignore_dirs or (
-            not scan_hidden and name.startswith('.')
-        )
-    )
-
-
-def _should_consider_file(
-    filename: str,
-    *, 
-    scan_hidden: bool, 
-    search_file_names: set[str] | None,
-    search_file_extensions: set[str] | None,
-) -> bool:
-    if not scan_hidden and filename.startswith("."):
-        return False
-
-    should_consider = True
 
-    if search_file_names:
-        should_consider = any(
-            _fnmatch.fnmatchcase(filename.casefold(), _normalise(to_search).casefold())
-            for to_search in search_file_names
-        )
+def _shared_executor() -> _futures.ThreadPoolExecutor:
+    global _EXECUTOR
 
-        if not should_consider:
-            return False
+    with _EXECUTOR_LOCK:
+        if _EXECUTOR is None:
+            _EXECUTOR = _futures.ThreadPoolExecutor(max_workers=_MAX_WORKERS)
+            _atexit.register(_EXECUTOR.shutdown)
 
-    if search_file_extensions:
-        should_consider = False
-        for ext in search_file_extensions:
-            ext_lower = ext.lower()
-            filename_lower = filename.lower()
+    return _EXECUTOR
 
-            if ext_lower.startswith("."):
-                ext_lower = ext_lower.split(".")[1]
 
-            if filename_lower.endswith("." + ext_lower):
-                should_consider = True
-                break
-
-    return should_consider
+def _normalise(item: str) -> str:
+    return item if any(c in item for c in _WILDCARD_CHARS) else f"*{item}*"
 
 
 class _TaskManager:
@@ -72,37 +50,87 @@ class _TaskManager:
         self._max_workers: int = 0
 
         self._path: str = params["path"]
-        self._ignore_dirs: set[str] = params["ignore_dirs"]
+        self._max_results: int | None = params["max_results"]
+        self._ignore_dirs: frozenset[str] = frozenset(params["ignore_dirs"])
         self._scan_hidden_dirs: bool = params["scan_hidden_dirs"]
         self._scan_hidden_files: bool = params["scan_hidden_files"]
         self._search_file_names: set[str] | None = params["search_file_names"]
         self._search_file_extensions: set[str] | None = params["search_file_extensions"]
-    
+
+        # Fuse the hidden-file, extension, and name checks into one regex so
+        # the per-file filter is a single C-level match against the folded
+        # name. The conditions are AND-ed via zero-width assertions.
+        filter_parts: list[str] = []
+
+        if not self._scan_hidden_files:
+            filter_parts.append(r"(?!\.)")
+
+        if self._search_file_extensions:
+            ext_alt = "|".join(
+                _re.escape("." + ext.casefold().lstrip("."))
+                for ext in self._search_file_extensions
+            )
+            filter_parts.append(rf"(?=(?s:.*)(?:{ext_alt})\Z)")
+
+        if self._search_file_names:
+            name_alt = "|".join(
+                _fnmatch.translate(_normalise(name).casefold())
+                for name in self._search_file_names
+            )
+            filter_parts.append(rf"(?=(?:{name_alt}))")
+
+        self._filter_match = (
+            _re.compile("".join(filter_parts)).match if filter_parts else None
+        )
+
+        self._stop = _threading.Event()
+        self._match_count: int = 0
+        self._match_lock = _threading.Lock()
+        self._scan_error: BaseException | None = None
+
+    def _should_skip_dir(self, path: str, name: str) -> bool:
+        return (
+            name in self._ignore_dirs
+            or path in self._ignore_dirs
+            or (not self._scan_hidden_dirs and name.startswith("."))
+        )
+
+    def _record_match(self) -> bool:
+        """
+        Count a matched file and signal all workers once max_results is hit.
+        """
+        if self._max_results is None:
+            return False
+
+        with self._match_lock:
+            self._match_count += 1
+
+            if self._match_count >= self._max_results:
+                self._stop.set()
+                return True
+
+        return False
+
     def skim_dir(self, path: str) -> dict:
         result: dict = {
             "__path__": str(path),
             "__files__": [],
         }
 
+        filter_match = self._filter_match
+
         try:
             with _os.scandir(path) as it:
                 for entry in it:
-                    if (
-                        entry.is_file(follow_symlinks=False)
-                        and _should_consider_file(
-                            entry.name,
-                            scan_hidden=self._scan_hidden_files, 
-                            search_file_names=self._search_file_names,
-                            search_file_extensions=self._search_file_extensions
-                        )
-                    ):
-                        result["__files__"].append(entry.name)
-                    
+                    if entry.is_file(follow_symlinks=False):
+                        if filter_match is None or filter_match(entry.name.casefold()):
+                            result["__files__"].append(_sys.intern(entry.name))
+
                     elif (
                         entry.is_dir(follow_symlinks=False)
-                        and not _ignore_dir(entry.path, entry.name, self._ignore_dirs, self._scan_hidden_dirs)
+                        and not self._should_skip_dir(entry.path, entry.name)
                     ):
-                        result[entry.name] = {
+                        result[_sys.intern(entry.name)] = {
                             "__path__": str(entry.path),
                             "__files__": []
                         }
@@ -112,77 +140,81 @@ class _TaskManager:
             
         return result
     
-    def _crawl_dir(self, out_bucket: dict) -> None:
-        assert "__path__" in out_bucket, "Provided bucket has no '__path__'"
-        assert "__files__" in out_bucket, "Provided bucket has no '__files__'"
+    def _scan_dir(self, target_path: str, target_bucket: dict, work_queue: _queue.Queue) -> None:
+        filter_match = self._filter_match
+
+        try:
+            with _os.scandir(target_path) as it:
+                for entry in it:
+                    if entry.is_file(follow_symlinks=False):
+                        if filter_match is None or filter_match(entry.name.casefold()):
+                            target_bucket["__files__"].append(_sys.intern(entry.name))
+
+                            if self._record_match():
+                                return
 
-        crawl_targets = [(out_bucket["__path__"], out_bucket)]
-        while crawl_targets:
-            target_path, target_bucket = crawl_targets.pop(0)
+                    elif (
+                        entry.is_dir(follow_symlinks=False)
+                        and not self._should_skip_dir(entry.path, entry.name)
+                    ):
+                        sub_bucket = {
+                            "__path__": entry.path,
+                            "__files__": []
+                        }
+                        target_bucket[_sys.intern(entry.name)] = sub_bucket
+                        work_queue.put((entry.path, sub_bucket))
+
+        except OSError as e:
+            target_bucket["__error__"] = str(e)
+
+    def _scan_worker(self, work_queue: _queue.Queue) -> None:
+        while True:
+            item = work_queue.get()
+            if item is None:
+                work_queue.task_done()
+                return
 
             try:
-                with _os.scandir(target_path) as it:
-                    for entry in it:
-                        if (
-                            entry.is_file(follow_symlinks=False)
-                            and _should_consider_file(
-                                entry.name,
-                                scan_hidden=self._scan_hidden_files, 
-                                search_file_names=self._search_file_names,
-                                search_file_extensions=self._search_file_extensions
-                            )
-                        ):
-                            target_bucket["__files__"].append(entry.name)
-                        
-                        elif (
-                            entry.is_dir(follow_symlinks=False)
-                            and not _ignore_dir(entry.path, entry.name, self._ignore_dirs, self._scan_hidden_dirs)
-                        ):
-                            target_bucket[entry.name] = {
-                                "__path__": entry.path,
-                                "__files__": []
-                            }
-                            crawl_targets.append(
-                                (entry.path, target_bucket[entry.name])
-                            )
-
-            except OSError as e:
-                target_bucket["__error__"] = str(e)
-        
-        print("Crawl finished", out_bucket["__path__"], "✅", flush=True)
-    
+                if not self._stop.is_set():
+                    target_path, target_bucket = item
+                    self._scan_dir(target_path, target_bucket, work_queue)
+            except BaseException as e:
+                # Record the failure and keep draining, otherwise
+                # begin_scan's join() would wait on a dead worker.
+                self._scan_error = self._scan_error or e
+                self._stop.set()
+            finally:
+                work_queue.task_done()
+
     @property
     def workers_deployed(self) -> int:
         return self._max_workers
-    
+
     def begin_scan(self) -> dict:
-        result_bucket: dict = self.skim_dir(self._path)
+        result_bucket: dict = {
+            "__path__": self._path,
+            "__files__": [],
+        }
 
-        if "__error__" in result_bucket:
-            return result_bucket
+        work_queue: _queue.Queue = _queue.Queue()
+        work_queue.put((self._path, result_bucket))
 
-        root_width = 0
-        for _, value in result_bucket.items():
-            if isinstance(value, dict):
-                root_width += 1
-        
-        if root_width == 0:
-            return result_bucket
+        self._max_workers = _MAX_WORKERS
 
-        self._max_workers = min(root_width, _MAX_WORKERS)
+        executor = _shared_executor()
+        workers = [
+            executor.submit(self._scan_worker, work_queue)
+            for _ in range(self._max_workers)
+        ]
 
-        with _futures.ThreadPoolExecutor(max_workers=self._max_workers) as executor:
-            futures = [
-                executor.submit(self._crawl_dir, value)
-                for _, value in result_bucket.items()
-                if isinstance(value, dict)
-            ]
-        
-            _futures.wait(futures, return_when=_futures.FIRST_EXCEPTION)
+        work_queue.join()
+        for _ in workers:
+            work_queue.put(None)
+
+        _futures.wait(workers)
 
-            for f in futures:
-                if exc := f.exception():
-                    raise exc
+        if self._scan_error is not None:
+            raise self._scan_error
 
         return result_bucket
 
@@ -193,11 +225,12 @@ class Scanner:
             if not directory.startswith("/"):
                 directory = "~/" + directory
 
-        self._root_path = _pathlib.Path(directory).expanduser()
+        self._root_path: str = _os.path.expanduser(directory)
         self._scan_result: dict[str, str | list[str] | dict] = {}
 
         self._gen_summary: bool = config.get("summarize", False)
         self._enable_cache: bool = config.get("enable_cache", True)
+        self._max_results: int | None = config.get("max_results", None)
         self._ignore_dirs: set[str] = config.get("ignore_dirs", _IGNORE_DIRS)
         self._output_file_name: str | None = config.get("output_file_name", None)
         self._scan_hidden_dirs: bool = config.get("scan_hidden_dirs", _SCAN_HIDDEN_DIRS)
@@ -207,7 +240,8 @@ class Scanner:
 
         self._task_man = _TaskManager(
             params={
-                "path": str(self._root_path),
+                "path": self._root_path,
+                "max_results": self._max_results,
                 "ignore_dirs": self._ignore_dirs,
                 "scan_hidden_dirs": self._scan_hidden_dirs,
                 "scan_hidden_files": self._scan_hidden_files,
@@ -234,41 +268,73 @@ class Scanner:
     def workers_deployed(self) -> int:
         return self._task_man.workers_deployed
 
+    def _cache_key(self) -> tuple:
+        return (
+            self._root_path,
+            self._max_results,
+            self._scan_hidden_dirs,
+            self._scan_hidden_files,
+            frozenset(self._ignore_dirs),
+            frozenset(self._search_file_names) if self._search_file_names else None,
+            frozenset(self._search_file_extensions) if self._search_file_extensions else None,
+        )
+
     @_helpers.time_it()
     def _deep_scan_dir(self) -> None:
-        if not (self._root_path.exists() and self._root_path.is_dir()):
+        if not _os.path.isdir(self._root_path):
             self._scan_result = {
-                "__path__": str(self._root_path),
+                "__path__": self._root_path,
                 "__files__": [],
                 "__error__": f"Provided path '{self._root_path}' does not exist."
             }
             return
 
+        cache_key = self._cache_key()
+
+        if self._enable_cache:
+            with _DEEP_SCAN_CACHE_LOCK:
+                if cache_key in _DEEP_SCAN_CACHE:
+                    # Re-insert to mark the entry as most recently used.
+                    self._scan_result = _DEEP_SCAN_CACHE.pop(cache_key)
+                    _DEEP_SCAN_CACHE[cache_key] = self._scan_result
+
+                    print("⚡ Using cached scan result", self._root_path, flush=True)
+                    return
+
         self._scan_result = self._task_man.begin_scan()
 
-    def _summarize(self, bucket: dict | None = None) -> tuple[int, int, int]:
-        if bucket is None:
-            bucket = self._scan_result
+        if self._enable_cache and "__error__" not in self._scan_result:
+            with _DEEP_SCAN_CACHE_LOCK:
+                _DEEP_SCAN_CACHE[cache_key] = self._scan_result
 
-        if "__error__" in  bucket:
-            return 1, 0, 0
+                while len(_DEEP_SCAN_CACHE) > _DEEP_SCAN_CACHE_MAX:
+                    _DEEP_SCAN_CACHE.pop(next(iter(_DEEP_SCAN_CACHE)))
 
+    def _summarize(self) -> tuple[int, int, int]:
         error_count = 0
-        dir_count = len(bucket) - 2
-        file_count = len(bucket["__files__"])
+        dir_count = 0
+        file_count = 0
 
-        for _, value in bucket.items():
-            if isinstance(value, dict):
-                ret = self._summarize(bucket=value)
-                dir_count += ret[1]
-                file_count += ret[2]
-                error_count += ret[0]
+        stack = [self._scan_result]
+        while stack:
+            bucket = stack.pop()
+
+            if "__error__" in bucket:
+                error_count += 1
+                continue
+
+            dir_count += len(bucket) - 2
+            file_count += len(bucket["__files__"])
+
+            for value in bucket.values():
+                if isinstance(value, dict):
+                    stack.append(value)
 
         return error_count, dir_count, file_count
     
     def shallow_scan(self) -> dict[str, str | list[str]]:
-        print("⏳ Shallow scan", str(self._root_path), flush=True)
-        scan_result = self._task_man.skim_dir(str(self._root_path))
+        print("⏳ Shallow scan", self._root_path, flush=True)
+        scan_result = self._task_man.skim_dir(self._root_path)
 
         result: dict = {
             "path": "",
@@ -287,21 +353,23 @@ class Scanner:
 
             elif isinstance(scan_result[key], dict):
                 result["dirs"].append(key)
-        
-        print(_json.dumps(result, indent=2), flush=True)
 
         return result
     
     def deep_scan(self):
-        print("⏳ Deep scan", str(self._root_path), flush=True)
+        print("⏳ Deep scan", self._root_path, flush=True)
         self._deep_scan_dir()
 
         if self._output_file_name:
             _os.makedirs("outputs", exist_ok=True)
             out_file_path = f"outputs/{self._output_file_name}.json"
             print(f"✍️   Writing '{out_file_path}' ... ", end="", flush=True)
-            with open(out_file_path, "w") as fh:
-                _json.dump(self._scan_result, fh, indent=4)
+            if _orjson is not None:
+                with open(out_file_path, "wb") as fh:
+                    fh.write(_orjson.dumps(self._scan_result, option=_orjson.OPT_INDENT_2))
+            else:
+                with open(out_file_path, "w") as fh:
+                    _json.dump(self._scan_result, fh, indent=2)
             print("✅")
 
         if self._gen_summary:
@@ -310,7 +378,7 @@ class Scanner:
             print("✅")
 
             print("")
-            print("Scanned", str(self._root_path))
+            print("Scanned", self._root_path)
             print(" - Hidden dirs:", "✅" if self._scan_hidden_dirs else "❌")
             print(" - Hidden files:", "✅" if self._scan_hidden_files else "❌")
             print(" - Ignored dirs:", self._ignore_dirs or "None")
@@ -325,24 +393,23 @@ class Scanner:
         print("✅ Deep scan complete.", flush=True)
     
     def search_scan(self) -> dict[str, list[str]]:
-        print("⏳ Search scan", str(self._root_path), flush=True)
+        print("⏳ Search scan", self._root_path, flush=True)
 
         self.deep_scan()
         search_result: dict[str, list[str]] = {}
 
-        def _compile_result(bucket: dict | None = None):
-            if bucket is None:
-                bucket = self._scan_result
-            
+        stack = [self._scan_result]
+        while stack:
+            bucket = stack.pop()
+
             if "__error__" in bucket:
-                return None
-            
+                continue
+
             if bucket["__files__"]:
                 search_result[bucket["__path__"]] = bucket["__files__"]
 
-            for _, value in bucket.items():
+            for value in bucket.values():
                 if isinstance(value, dict):
-                    _compile_result(value)
-        
-        _compile_result()
+                    stack.append(value)
+
         return search_result